@@ -109,6 +109,10 @@ async def shutdown():
     # Close database connections
     await close_db_pool()
 
+    # Close the shared Henrik API session
+    from utils.henrik import close_session
+    await close_session()
+
     # Close bot
     if not bot.is_closed():
         await bot.close()
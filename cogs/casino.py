@@ -66,7 +66,7 @@ class RPSView(View):
                 "UPDATE coins SET balance = GREATEST(balance + $2, 0) WHERE user_id = $1",
                 self.user.id, delta
             )
-            await self.bot.get_cog("Coins").refresh_leaderboard()
+            self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
             user_display = f"{self.user.display_name} 님"
             await log_to_channel(
@@ -240,7 +240,7 @@ class DuelView(discord.ui.View):
         public = interaction.guild.get_channel(config.DICE_DUEL_CHANNEL_ID)
         await public.send(f"🎲 **주사위 대결 결과**\n{result}", allowed_mentions=AllowedMentions(users=True))
 
-        await interaction.client.get_cog("Coins").refresh_leaderboard()
+        interaction.client.get_cog("Coins").schedule_leaderboard_refresh()
 
         for child in self.children:
             child.disabled = True
@@ -334,7 +334,7 @@ class Casino(commands.Cog):
             "UPDATE coins SET balance = GREATEST(balance + $2, 0) WHERE user_id = $1",
             interaction.user.id, net
         )
-        await self.bot.get_cog("Coins").refresh_leaderboard()
+        self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
         # ▶ Log here: 슬롯 결과 기록
         try:
@@ -376,7 +376,7 @@ class Casino(commands.Cog):
             "UPDATE coins SET balance = balance - $2 WHERE user_id = $1",
             interaction.user.id, bet
         )
-        await self.bot.get_cog("Coins").refresh_leaderboard()
+        self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
         # ── 3) defer & 덱 준비
         await interaction.response.defer(thinking=True)
@@ -452,7 +452,7 @@ class Casino(commands.Cog):
                 "UPDATE coins SET balance = balance + $2 WHERE user_id = $1",
                 player.id, bet * 2
             )
-            await self.bot.get_cog("Coins").refresh_leaderboard()
+            self.bot.get_cog("Coins").schedule_leaderboard_refresh()
             return
 
         # ── 8) 버튼 정의 & 활성화 체크
@@ -528,7 +528,7 @@ class Casino(commands.Cog):
 
             embed.title = "\n".join(summary)
             await i.response.edit_message(embed=embed, view=view)
-            await self.bot.get_cog("Coins").refresh_leaderboard()
+            self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
             user_display = f"{player.display_name} 님"
             await log_to_channel(
@@ -557,7 +557,7 @@ class Casino(commands.Cog):
                 "UPDATE coins SET balance = balance - $2 WHERE user_id = $1",
                 player.id, extra
             )
-            await self.bot.get_cog("Coins").refresh_leaderboard()
+            self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
             is_doubled[current] = True
             hand_bets[current] *= 2
@@ -613,7 +613,7 @@ class Casino(commands.Cog):
                 "UPDATE coins SET balance = balance - $2 WHERE user_id = $1",
                 player.id, original
             )
-            await self.bot.get_cog("Coins").refresh_leaderboard()
+            self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
             c1, c2 = hands[0]
             hands[:] = [[c1, deck.pop()], [c2, deck.pop()]]
@@ -700,7 +700,7 @@ class Casino(commands.Cog):
 
         # 4) 응답 & 리더보드 갱신
         await interaction.response.send_message(text)
-        await self.bot.get_cog("Coins").refresh_leaderboard()
+        self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
     @app_commands.command(name="주사위", description="🎲 PvP 주사위 대결")
     @app_commands.describe(opponent="도전할 상대 멘션", bet="베팅할 코인 수")
@@ -826,7 +826,7 @@ class Casino(commands.Cog):
             "UPDATE coins SET balance = GREATEST(balance + $2, 0) WHERE user_id = $1",
             interaction.user.id, net
         )
-        await self.bot.get_cog("Coins").refresh_leaderboard()
+        self.bot.get_cog("Coins").schedule_leaderboard_refresh()
 
         # ▶ Log here: 룰렛 결과 기록
         user_display = f"{interaction.user.display_name} 님"
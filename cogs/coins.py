@@ -2,13 +2,22 @@
 
 import discord
 import asyncio
-import pytz
+import time
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import View, Button
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 from utils import config
-from utils.logger import log_to_channel
+from utils.logger import log_to_channel, log_lines_to_channel
+
+# Seconds a fetched leaderboard page is reused before hitting the DB again
+LEADERBOARD_CACHE_TTL = 60
+# Minimum seconds between edits of the leaderboard message
+LEADERBOARD_MIN_INTERVAL = 300
+
+# Daily claims reset at midnight Eastern
+EASTERN = ZoneInfo("America/New_York")
 
 # Database table creation SQL
 CREATE_COINS_TABLE_SQL = """
@@ -41,19 +50,28 @@ CREATE_DAILY_CLAIM_TABLE_SQL = """
                                ); \
                                """
 
+# Backs the leaderboard's ORDER BY balance DESC, user_id DESC so keyset pages seek straight into the index
+CREATE_COINS_BALANCE_INDEX_SQL = """
+                                 CREATE INDEX IF NOT EXISTS coins_balance_user_idx ON coins (balance DESC, user_id DESC);
+                                 """
+
 
 class LeaderboardView(View):
-    def __init__(self, cog, page=0, per_page=10):
+    def __init__(self, cog, page=0, per_page=10, cursors=None):
         super().__init__(timeout=None)
         self.cog = cog
         self.page = page
         self.per_page = per_page
+        # cursors[i] is the (balance, user_id) key page i starts after; page 0 starts at the top
+        self.cursors = cursors or [None]
 
     async def update_embed(self, interaction: discord.Interaction):
-        embed = await self.cog.build_leaderboard_embed(page=self.page, per_page=self.per_page)
+        embed = await self.cog.build_leaderboard_embed(
+            page=self.page, per_page=self.per_page, after=self.cursors[self.page]
+        )
         await interaction.response.edit_message(
             embed=embed,
-            view=LeaderboardView(self.cog, page=self.page, per_page=self.per_page)
+            view=LeaderboardView(self.cog, page=self.page, per_page=self.per_page, cursors=self.cursors)
         )
 
     @discord.ui.button(label="⏮️", style=discord.ButtonStyle.secondary, custom_id="prev_page")
@@ -66,9 +84,14 @@ class LeaderboardView(View):
 
     @discord.ui.button(label="⏭️", style=discord.ButtonStyle.secondary, custom_id="next_page")
     async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
-        total_count = await self.cog.bot.db.fetchval("SELECT COUNT(*) FROM coins")
-        max_page = (total_count - 1) // self.per_page
-        if self.page < max_page:
+        start = self.cursors[self.page]
+        end = self.cog._page_ends.get((start, self.per_page))
+        if end is None:
+            # End of this page unknown (not rendered yet, or balances changed); build it once to find it
+            await self.cog.build_leaderboard_embed(page=self.page, per_page=self.per_page, after=start)
+            end = self.cog._page_ends.get((start, self.per_page))
+        if end is not None:
+            self.cursors = self.cursors[:self.page + 1] + [end]
             self.page += 1
             await self.update_embed(interaction)
         else:
@@ -85,8 +108,7 @@ class DailyCoinsView(View):
         await interaction.response.defer(ephemeral=True)
         user = interaction.user
         now_utc = datetime.now(timezone.utc)
-        eastern = pytz.timezone("America/New_York")
-        today_et = now_utc.astimezone(eastern).date()
+        today_et = now_utc.astimezone(EASTERN).date()
 
         try:
             # Check last claim
@@ -94,8 +116,8 @@ class DailyCoinsView(View):
                 "SELECT last_claim FROM daily_coin_claim WHERE user_id = $1",
                 user.id
             )
-            if row and row["last_claim"].astimezone(eastern).date() == today_et:
-                now_et = now_utc.astimezone(eastern)
+            if row and row["last_claim"].astimezone(EASTERN).date() == today_et:
+                now_et = now_utc.astimezone(EASTERN)
                 next_midnight = (now_et + timedelta(days=1)).replace(
                     hour=0, minute=0, second=0, microsecond=0
                 )
@@ -140,7 +162,7 @@ class DailyCoinsView(View):
             # Refresh leaderboard
             coins_cog = self.bot.get_cog("Coins")
             if coins_cog:
-                await coins_cog.refresh_leaderboard()
+                coins_cog.schedule_leaderboard_refresh()
 
         except Exception as e:
             await interaction.followup.send(
@@ -158,6 +180,17 @@ class Coins(commands.Cog):
         self._update_lock = asyncio.Lock()
         self._backoff_time = 5
         self._leaderboard_message = None
+        self._refresh_task = None
+        # Set when a refresh is requested while one is already running; it reruns once afterwards
+        self._refresh_pending = False
+        # (after, per_page) -> (balance, user_id) of that page's last row, set only when more rows follow
+        self._page_ends = {}
+        # (page, after, per_page) -> (fetched_at, rows, has_more, total); cleared whenever balances change
+        self._page_cache = {}
+        # (fetched_at, total) for the footer's page count
+        self._count_cache = None
+        # Bumped on every balance change; fetches that straddle a bump don't fill the caches
+        self._cache_generation = 0
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -169,9 +202,11 @@ class Coins(commands.Cog):
 
         self._setup_done = True
 
-        async with self.bot.db.acquire() as conn:
-            await conn.execute(CREATE_COINS_TABLE_SQL)
-            await conn.execute(CREATE_DAILY_CLAIM_TABLE_SQL)
+        # All schema DDL in one round-trip and one transaction
+        async with self.bot.db.acquire() as conn, conn.transaction():
+            await conn.execute(
+                CREATE_COINS_TABLE_SQL + CREATE_DAILY_CLAIM_TABLE_SQL + CREATE_COINS_BALANCE_INDEX_SQL
+            )
 
         coin_ch = self.bot.get_channel(config.DAILY_COINS_CHANNEL_ID)
         if not coin_ch:
@@ -203,21 +238,58 @@ class Coins(commands.Cog):
         except Exception as e:
             await log_to_channel(self.bot, f"❌ 코인 버튼 생성 실패: {e}")
 
-    async def build_leaderboard_embed(self, page=0, per_page=10) -> discord.Embed:
+    async def build_leaderboard_embed(self, page=0, per_page=10, after=None) -> discord.Embed:
+        """Render one leaderboard page. `after` is the (balance, user_id) key of the previous page's last row."""
         offset = page * per_page
+        cached = self._page_cache.get((page, after, per_page))
+        generation = self._cache_generation
         try:
-            total_count = await self.bot.db.fetchval("SELECT COUNT(*) FROM coins")
-            rows = await self.bot.db.fetch(
-                "SELECT user_id, balance FROM coins ORDER BY balance DESC LIMIT $1 OFFSET $2",
-                per_page, offset
-            )
+            if cached and time.monotonic() - cached[0] < LEADERBOARD_CACHE_TTL:
+                _, rows, has_more, total_count = cached
+            else:
+                # Keyset pagination: seek past the previous page's last row instead of OFFSET-scanning.
+                # One extra row tells us whether another page follows without reading the rest.
+                if after is None:
+                    rows = await self.bot.db.fetch(
+                        """
+                        SELECT user_id, balance
+                        FROM coins
+                        ORDER BY balance DESC, user_id DESC
+                        LIMIT $1
+                        """,
+                        per_page + 1
+                    )
+                else:
+                    rows = await self.bot.db.fetch(
+                        """
+                        SELECT user_id, balance
+                        FROM coins
+                        WHERE (balance, user_id) < ($2, $3)
+                        ORDER BY balance DESC, user_id DESC
+                        LIMIT $1
+                        """,
+                        per_page + 1, after[0], after[1]
+                    )
+                has_more = len(rows) > per_page
+                rows = rows[:per_page]
+                total_count = await self._leaderboard_count()
+                if generation == self._cache_generation:
+                    self._page_cache[(page, after, per_page)] = (time.monotonic(), rows, has_more, total_count)
+            # Page boundaries read before a balance change would be stale
+            if generation == self._cache_generation:
+                if has_more:
+                    self._page_ends[(after, per_page)] = (rows[-1]["balance"], rows[-1]["user_id"])
+                else:
+                    self._page_ends.pop((after, per_page), None)
         except Exception as e:
             await log_to_channel(self.bot, f"❌ 리더보드 조회 오류: {e}")
             rows = []
+            total_count = 0
 
         embed = discord.Embed(
             title=f"🏆 코인 리더보드 (Top {offset + 1}-{offset + len(rows)})",
-            color=discord.Color.gold()
+            color=discord.Color.gold(),
+            timestamp=datetime.now(timezone.utc)  # rendered in each viewer's local time
         )
 
         if not rows:
@@ -230,9 +302,45 @@ class Coins(commands.Cog):
             embed.description = "\n".join(lines)
 
         max_page = max(0, (total_count - 1) // per_page)
-        embed.set_footer(text=f"페이지 {page + 1}/{max_page + 1} | 업데이트: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        embed.set_footer(text=f"페이지 {page + 1}/{max_page + 1} | 업데이트")
         return embed
 
+    async def _leaderboard_count(self) -> int:
+        """Total coin holders for the page footer, cached with the same TTL as the pages."""
+        if self._count_cache and time.monotonic() - self._count_cache[0] < LEADERBOARD_CACHE_TTL:
+            return self._count_cache[1]
+        generation = self._cache_generation
+        total = await self.bot.db.fetchval("SELECT COUNT(*) FROM coins")
+        if generation == self._cache_generation:
+            self._count_cache = (time.monotonic(), total)
+        return total
+
+    def schedule_leaderboard_refresh(self, delay: float = 5.0):
+        """Refresh the leaderboard in the background: at most one run in flight plus one queued."""
+        # Balances changed, so cached pages and page boundaries are stale
+        self._page_cache.clear()
+        self._page_ends.clear()
+        self._count_cache = None
+        self._cache_generation += 1
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_pending = True
+            return
+        self._refresh_task = asyncio.create_task(self._delayed_refresh(delay))
+
+    async def _delayed_refresh(self, delay: float):
+        while True:
+            # Wait out the edit throttle too, so the run isn't skipped by refresh_leaderboard
+            wait = delay
+            if self._last_leaderboard_update:
+                elapsed = (datetime.now(timezone.utc) - self._last_leaderboard_update).total_seconds()
+                wait = max(wait, LEADERBOARD_MIN_INTERVAL - elapsed + 1)
+            await asyncio.sleep(wait)
+            # Requests made while sleeping are covered by this run
+            self._refresh_pending = False
+            await self.refresh_leaderboard()
+            if not self._refresh_pending:
+                return
+
     async def refresh_leaderboard(self, force=False):
         if self._update_lock.locked():
             return
@@ -241,7 +349,7 @@ class Coins(commands.Cog):
             try:
                 current_time = datetime.now(timezone.utc)
                 if not force and self._last_leaderboard_update and \
-                        (current_time - self._last_leaderboard_update).total_seconds() < 300:
+                        (current_time - self._last_leaderboard_update).total_seconds() < LEADERBOARD_MIN_INTERVAL:
                     return
 
                 coin_ch = self.bot.get_channel(config.DAILY_COINS_CHANNEL_ID)
@@ -355,45 +463,51 @@ class Coins(commands.Cog):
             )
 
         summary = []
-        for m in members:
-            row = await self.bot.db.fetchrow(
-                "SELECT balance FROM coins WHERE user_id = $1", m.id
-            )
-            old_bal = row["balance"] if row else 0
-
-            if action.value == "add":
-                new_bal = old_bal + amount
-                delta = amount
-            elif action.value == "remove":
-                new_bal = max(0, old_bal - amount)
-                delta = new_bal - old_bal
-            else:  # set
-                new_bal = max(0, amount)
-                delta = new_bal - old_bal
-
-            await self.bot.db.execute(
-                """
-                INSERT INTO coins (user_id, balance)
-                VALUES ($1, $2)
-                ON CONFLICT (user_id) DO UPDATE
-                  SET balance = EXCLUDED.balance
-                """,
-                m.id, new_bal
-            )
+        changes = []
+        # One pooled connection for every member's read + write
+        async with self.bot.db.acquire() as conn:
+            for m in members:
+                row = await conn.fetchrow(
+                    "SELECT balance FROM coins WHERE user_id = $1", m.id
+                )
+                old_bal = row["balance"] if row else 0
+
+                if action.value == "add":
+                    new_bal = old_bal + amount
+                    delta = amount
+                elif action.value == "remove":
+                    new_bal = max(0, old_bal - amount)
+                    delta = new_bal - old_bal
+                else:  # set
+                    new_bal = max(0, amount)
+                    delta = new_bal - old_bal
+
+                await conn.execute(
+                    """
+                    INSERT INTO coins (user_id, balance)
+                    VALUES ($1, $2)
+                    ON CONFLICT (user_id) DO UPDATE
+                      SET balance = EXCLUDED.balance
+                    """,
+                    m.id, new_bal
+                )
 
-            sign = "+" if delta > 0 else ""
-            summary.append(f"{m.mention}: {sign}{delta} 코인 ({old_bal} → {new_bal})")
-            actor_display = f"{interaction.user.display_name}님"
-            target_display = f"{m.display_name}님"
-            action_ko = "추가" if action.value == "add" else ("제거" if action.value == "remove" else "설정")
-            await log_to_channel(
-                self.bot,
-                f"🛠️ [코인 수정] {actor_display}이(가) {target_display}님의 코인을 "
-                f"{old_bal} → {new_bal}으로 {action_ko}했습니다."
-            )
+                sign = "+" if delta > 0 else ""
+                summary.append(f"{m.mention}: {sign}{delta} 코인 ({old_bal} → {new_bal})")
+                changes.append((m, old_bal, new_bal))
+
+        # Log once in the background after releasing the connection
+        actor_display = f"{interaction.user.display_name}님"
+        action_ko = "추가" if action.value == "add" else ("제거" if action.value == "remove" else "설정")
+        log_lines = [
+            f"🛠️ [코인 수정] {actor_display}이(가) {m.display_name}님의 코인을 "
+            f"{old_bal} → {new_bal}으로 {action_ko}했습니다."
+            for m, old_bal, new_bal in changes
+        ]
+        log_lines_to_channel(self.bot, log_lines)
 
         # refresh the in‑channel leaderboard
-        await self.refresh_leaderboard()
+        self.schedule_leaderboard_refresh()
 
         embed = discord.Embed(
             title="🛠️ 코인 수정 결과",
@@ -430,42 +544,42 @@ class Coins(commands.Cog):
                 "❌ 자신에게는 전송할 수 없습니다.", ephemeral=True
             )
 
-        # 잔액 확인
-        row = await self.bot.db.fetchrow(
-            "SELECT balance FROM coins WHERE user_id = $1",
-            sender.id
-        )
-        sender_bal = row["balance"] if row else 0
-        if sender_bal < amount:
-            return await interaction.response.send_message(
-                "❌ 잔액이 부족합니다.", ephemeral=True
-            )
-
         # 수수료 및 실수령액 계산
         fee = int(amount * 0.10)
         net = amount - fee
 
-        # 트랜잭션: 수신자 지급, 송금자 차감
-        await self.bot.db.execute(
-            """
-            INSERT INTO coins (user_id, balance)
-            VALUES ($1, $2)
-            ON CONFLICT (user_id) DO UPDATE
-              SET balance = coins.balance + $2
-            """,
-            recipient.id, net
-        )
-        await self.bot.db.execute(
-            """
-            UPDATE coins
-               SET balance = balance - $2
-             WHERE user_id = $1
-            """,
-            sender.id, amount
-        )
+        async with self.bot.db.acquire() as conn:
+            # 트랜잭션: 송금자 차감(잔액이 충분할 때만), 수신자 지급
+            async with conn.transaction():
+                # Check and debit in one statement so concurrent transfers can't overdraw
+                debited = await conn.fetchrow(
+                    """
+                    UPDATE coins
+                       SET balance = balance - $2
+                     WHERE user_id = $1 AND balance >= $2
+                    RETURNING balance
+                    """,
+                    sender.id, amount
+                )
+                if debited is not None:
+                    await conn.execute(
+                        """
+                        INSERT INTO coins (user_id, balance)
+                        VALUES ($1, $2)
+                        ON CONFLICT (user_id) DO UPDATE
+                          SET balance = coins.balance + $2
+                        """,
+                        recipient.id, net
+                    )
+
+        # Reply only after the connection is back in the pool
+        if debited is None:
+            return await interaction.response.send_message(
+                "❌ 잔액이 부족합니다.", ephemeral=True
+            )
 
         # 리더보드 갱신
-        await self.refresh_leaderboard()
+        self.schedule_leaderboard_refresh()
 
         # 1) Sender에게 응답
         await interaction.response.send_message(
@@ -13,7 +13,7 @@ from discord import app_commands, Interaction, File
 from discord.ext import commands
 from discord.ui import View, Button
 from utils import config
-from utils.logger import log_to_channel
+from utils.logger import log_to_channel, log_lines_to_channel
 from datetime import datetime, timezone
 import weakref
 import gc
@@ -286,6 +286,8 @@ class CrashRound:
             # Process results
             cp = self.crash_point
             summary_lines = [f"💥 크래시 결과: **{cp:.2f}×**"]
+            settlements = []  # (user_id, net) for one batched balance update
+            log_lines = []
 
             for m, bet in self.queue:
                 cashed = self.view.cashouts.get(m.id) if self.view else None
@@ -300,27 +302,28 @@ class CrashRound:
                     result = "실패"
 
                 summary_lines.append(line)
-
-                # Update database with error handling
-                try:
-                    await self.bot.db.execute(
-                        "UPDATE coins SET balance = GREATEST(balance + $2, 0) WHERE user_id = $1",
-                        m.id, net
-                    )
-
-                    coins_cog = self.bot.get_cog("Coins")
-                    if coins_cog:
-                        await coins_cog.refresh_leaderboard()
-                except Exception as e:
-                    await log_to_channel(self.bot, f"❌ [크래시] DB 업데이트 실패: {e}")
-
-                # Log results
+                settlements.append((m.id, net))
                 participant_display = f"{m.display_name}님"
-                await log_to_channel(
-                    self.bot,
+                log_lines.append(
                     f"📊 [크래시 결과] {participant_display} 베팅 {bet}코인 → 결과: {result}, {net:+}코인"
                 )
 
+            # Log results in the background, 10 per message to stay under Discord's length limit
+            log_lines_to_channel(self.bot, log_lines)
+
+            # Update database in one batch, then refresh the leaderboard once
+            try:
+                await self.bot.db.executemany(
+                    "UPDATE coins SET balance = GREATEST(balance + $2, 0) WHERE user_id = $1",
+                    settlements
+                )
+
+                coins_cog = self.bot.get_cog("Coins")
+                if coins_cog:
+                    coins_cog.schedule_leaderboard_refresh()
+            except Exception as e:
+                await log_to_channel(self.bot, f"❌ [크래시] DB 업데이트 실패: {e}")
+
             # Send final message
             if self.msg:
                 try:
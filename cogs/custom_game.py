@@ -5,11 +5,11 @@ import random
 from typing import Optional, List, Union
 from utils.henrik import henrik_get
 
-import pytz
 import discord
 from discord import app_commands, AllowedMentions
 from discord.ext import commands
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 from utils import config
 from utils.logger import log_to_channel
@@ -20,6 +20,18 @@ MAPS = [
     "Ascent", "Haven", "Icebox", "Lotus", "Pearl", "Split", "Sunset"
 ]
 
+# Zones offered by /내전, built once instead of per command
+TIMEZONES = {name: ZoneInfo(name) for name in ("US/Eastern", "US/Central", "US/Pacific")}
+
+
+async def sleep_until(target: datetime):
+    """Sleep until an aware UTC time, re-checking the wall clock at least hourly."""
+    while True:
+        remaining = (target - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(3600, remaining))
+
 
 def is_privileged(user: discord.Member, creator: discord.Member) -> bool:
     """True if the user is the creator or has any admin role."""
@@ -241,16 +253,16 @@ class CustomGame(commands.Cog):
                 raise ValueError("시간 형식(예: 22:00 또는 10:00 PM)이 잘못되었습니다.")
 
             # 4) Convert to UTC
-            user_tz = pytz.timezone(tz_map[zone.lower()])
+            user_tz = TIMEZONES[tz_map[zone.lower()]]
             local_date = datetime.now(user_tz).date()
-            local_dt = user_tz.localize(datetime.combine(local_date, dt.time()))
+            local_dt = datetime.combine(local_date, dt.time(), tzinfo=user_tz)
             utc_dt = local_dt.astimezone(timezone.utc)
             if utc_dt < datetime.now(timezone.utc):
                 utc_dt += timedelta(days=1)
 
             # 5) Build display string
             display = "\n".join(
-                f"**{lbl}:** {utc_dt.astimezone(pytz.timezone(tz)).strftime('%I:%M %p').lstrip('0')}"
+                f"**{lbl}:** {utc_dt.astimezone(TIMEZONES[tz]).strftime('%I:%M %p').lstrip('0')}"
                 for lbl, tz in [
                     ("EST", "US/Eastern"),
                     ("CST", "US/Central"),
@@ -310,10 +322,7 @@ class CustomGame(commands.Cog):
         while getattr(self.bot, "current_custom_game", None) is not view:
             await asyncio.sleep(0.5)
 
-        warn_time = view.voice_check_end - timedelta(minutes=30)
-        delay = (warn_time - datetime.now(timezone.utc)).total_seconds()
-        if delay > 0:
-            await asyncio.sleep(delay)
+        await sleep_until(view.voice_check_end - timedelta(minutes=30))
 
         if getattr(self.bot, "current_custom_game", None) is view:
             mentions = " ".join(
@@ -333,9 +342,7 @@ class CustomGame(commands.Cog):
         while getattr(self.bot, "current_custom_game", None) is not view:
             await asyncio.sleep(0.5)
 
-        delay = (view.voice_check_start - datetime.now(timezone.utc)).total_seconds()
-        if delay > 0:
-            await asyncio.sleep(delay)
+        await sleep_until(view.voice_check_start)
 
         while getattr(self.bot, "current_custom_game", None) is view and datetime.now(timezone.utc) < view.voice_check_end:
             remaining = (view.voice_check_end - datetime.now(timezone.utc)).total_seconds() / 60
@@ -379,8 +386,11 @@ class CustomGame(commands.Cog):
             riot_tag = row["riot_tag"]
             puuid = row["puuid"]
 
-            # 2) Fetch recent matches from Henrik
-            data = await henrik_get(f"/valorant/v3/by-puuid/matches/na/{puuid}")
+            # 2) Fetch recent matches from Henrik and 3) all linked puuids concurrently
+            data, rows = await asyncio.gather(
+                henrik_get(f"/valorant/v3/by-puuid/matches/na/{puuid}"),
+                self.bot.db.fetch("SELECT puuid FROM players")
+            )
             if not data or "data" not in data:
                 await interaction.followup.send(
                     "❌ 최근 경기 정보를 가져오지 못했습니다.",
@@ -388,10 +398,7 @@ class CustomGame(commands.Cog):
                 )
                 return
 
-            # 3) Build a set of all linked puuids
-            async with self.bot.db.acquire() as conn:
-                rows = await conn.fetch("SELECT puuid FROM players")
-                linked_puuids = {r["puuid"] for r in rows}
+            linked_puuids = {r["puuid"] for r in rows}
 
             # 4) Filter out only full 10‐player matches where every puuid is linked
             custom_candidates = []
@@ -401,112 +408,111 @@ class CustomGame(commands.Cog):
                     custom_candidates.append(match)
 
             count = 0
+            # Rows for match_players, inserted in one batch
+            match_rows = []
+            # puuid -> last_active; matches arrive newest first, so the first timestamp wins
+            last_active = {}
             # 5) Insert up to 3 full‐party matches into DB (match_players),
             #    and update each participant’s last_active to the match’s timestamp
-            async with self.bot.db.acquire() as conn:
-                for match in custom_candidates[:3]:
-                    meta = match["metadata"]
-                    match_id = meta["matchid"]
-                    game_start = meta.get("game_start", datetime.utcnow())
-                    map_name = meta.get("map", "?")
-                    rounds = meta.get("rounds_played", 0)
-
-                    # For reference: the invoking player's data (to compute their HS%, ADR, etc.)
-                    player_data = next(
-                        (p for p in match["players"]["all_players"] if p["puuid"] == puuid),
-                        None
-                    )
-                    if not player_data:
-                        continue
-
-                    stats = player_data["stats"]
-                    # These two lines aren’t strictly needed for the inserts below,
-                    # but left here in case you want to log or use them:
-                    _kda = f"{stats['kills']}/{stats['deaths']}/{stats['assists']}"
-                    _hs = stats.get("headshots", 0)
-                    _bs = stats.get("bodyshots", 0)
-                    _ls = stats.get("legshots", 0)
-                    _shots = _hs + _bs + _ls
-                    _hs_pct = (_hs / _shots) * 100 if _shots else 0
-                    _adr = player_data.get("damage_made", 0) // max(rounds, 1)
-
-                    # Determine each team’s final rounds_won (adjust keys if needed)
-                    team1_score = match.get("teams", {}).get("red", {}).get("rounds_won", 0)
-                    team2_score = match.get("teams", {}).get("blue", {}).get("rounds_won", 0)
-
-                    for p in match["players"]["all_players"]:
-                        puuid2 = p["puuid"]
-                        riot_name2 = p.get("name", "?")
-                        riot_tag2 = p.get("tag", "?")
-                        agent = p.get("character", "?")
-                        stats2 = p["stats"]
-
-                        kills = stats2.get("kills", 0)
-                        deaths = stats2.get("deaths", 0)
-                        assists = stats2.get("assists", 0)
-                        score = stats2.get("score", 0)
-                        kda = f"{kills}/{deaths}/{assists}"
-
-                        hs = stats2.get("headshots", 0)
-                        bs = stats2.get("bodyshots", 0)
-                        ls = stats2.get("legshots", 0)
-                        shots = hs + bs + ls
-                        hs_pct = (hs / shots) * 100 if shots else 0
-                        rounds_played = meta.get("rounds_played", 0) or 1
-                        adr = p.get("damage_made", 0) // rounds_played
-
-                        team = p.get("team", "?")
-                        won = match.get("teams", {}).get(team.lower(), {}).get("has_won", False)
-                        round_count = meta.get("rounds_played", 0)
-                        tier = p.get("currenttier_patched", None)
-
-                        # Insert into match_players table
-                        await conn.execute(
-                            """
-                            INSERT INTO match_players (
-                              match_id, puuid, riot_name, riot_tag, map, agent,
-                              kda, kills, deaths, assists, score, adr, hs_pct,
-                              team, won, round_count, team1_score, team2_score,
-                              tier, game_start
-                            )
-                            VALUES (
-                              $1, $2, $3, $4, $5, $6,
-                              $7, $8, $9, $10, $11, $12, $13,
-                              $14, $15, $16, $17, $18,
-                              $19, $20
-                            ) ON CONFLICT (match_id, puuid) DO NOTHING
-                            """,
-                            match_id,
-                            puuid2,
-                            riot_name2,
-                            riot_tag2,
-                            map_name,
-                            agent,
-                            kda,
-                            kills,
-                            deaths,
-                            assists,
-                            score,
-                            adr,
-                            hs_pct,
-                            team,
-                            won,
-                            round_count,
-                            team1_score,
-                            team2_score,
-                            tier,
-                            game_start
-                        )
+            now_utc = datetime.now(timezone.utc)
+            for match in custom_candidates[:3]:
+                meta = match["metadata"]
+                match_id = meta["matchid"]
+                # Henrik reports game_start as epoch seconds
+                start_ts = meta.get("game_start")
+                game_start = datetime.fromtimestamp(start_ts, tz=timezone.utc) if start_ts else now_utc
+                map_name = meta.get("map", "?")
+
+                # Only record matches the invoking player actually took part in
+                players_by_puuid = {p["puuid"]: p for p in match["players"]["all_players"]}
+                if puuid not in players_by_puuid:
+                    continue
 
-                        # Immediately after inserting this player’s row,
-                        # update their last_active to the match’s timestamp
-                        await conn.execute(
-                            "UPDATE players SET last_active = $1 WHERE puuid = $2",
-                            game_start,
-                            puuid2
+                # Per-match values, unpacked once instead of per player
+                teams = match.get("teams", {})
+                round_count = meta.get("rounds_played", 0)
+                rounds_played = round_count or 1
+
+                # Determine each team’s final rounds_won (adjust keys if needed)
+                team1_score = teams.get("red", {}).get("rounds_won", 0)
+                team2_score = teams.get("blue", {}).get("rounds_won", 0)
+
+                for puuid2, p in players_by_puuid.items():
+                    riot_name2 = p.get("name", "?")
+                    riot_tag2 = p.get("tag", "?")
+                    agent = p.get("character", "?")
+                    stats2 = p["stats"]
+
+                    kills = stats2.get("kills", 0)
+                    deaths = stats2.get("deaths", 0)
+                    assists = stats2.get("assists", 0)
+                    score = stats2.get("score", 0)
+                    kda = f"{kills}/{deaths}/{assists}"
+
+                    hs = stats2.get("headshots", 0)
+                    bs = stats2.get("bodyshots", 0)
+                    ls = stats2.get("legshots", 0)
+                    shots = hs + bs + ls
+                    hs_pct = 100.0 * hs / (shots or 1)
+                    adr = p.get("damage_made", 0) // rounds_played
+
+                    team = p.get("team", "?")
+                    won = teams.get(team.lower(), {}).get("has_won", False)
+                    tier = p.get("currenttier_patched", None)
+
+                    match_rows.append((
+                        match_id,
+                        puuid2,
+                        riot_name2,
+                        riot_tag2,
+                        map_name,
+                        agent,
+                        kda,
+                        kills,
+                        deaths,
+                        assists,
+                        score,
+                        adr,
+                        hs_pct,
+                        team,
+                        won,
+                        round_count,
+                        team1_score,
+                        team2_score,
+                        tier,
+                        game_start
+                    ))
+                    last_active.setdefault(puuid2, game_start)
+
+                count += 1
+
+            # Hold a pooled connection only for the writes, not while building rows
+            async with self.bot.db.acquire() as conn:
+                # Both batches in one transaction so a recorded game is all-or-nothing
+                async with conn.transaction():
+                    await conn.executemany(
+                        """
+                        INSERT INTO match_players (
+                          match_id, puuid, riot_name, riot_tag, map, agent,
+                          kda, kills, deaths, assists, score, adr, hs_pct,
+                          team, won, round_count, team1_score, team2_score,
+                          tier, game_start
                         )
+                        VALUES (
+                          $1, $2, $3, $4, $5, $6,
+                          $7, $8, $9, $10, $11, $12, $13,
+                          $14, $15, $16, $17, $18,
+                          $19, $20
+                        ) ON CONFLICT (match_id, puuid) DO NOTHING
+                        """,
+                        match_rows
+                    )
 
-                    count += 1
+                    # Update every participant's last_active in one batch
+                    await conn.executemany(
+                        "UPDATE players SET last_active = $1 WHERE puuid = $2",
+                        [(ts, pid) for pid, ts in last_active.items()]
+                    )
 
             # 6) Now that the database is fully updated, purge the previous lobby messages
             #    (adjust the limit as needed; here we remove up to 100)
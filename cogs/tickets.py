@@ -1,5 +1,6 @@
 # cogs/tickets.py new
 
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands, File
@@ -71,7 +72,7 @@ class CloseTicketView(View):
     @discord.ui.button(label="티켓 닫기", style=discord.ButtonStyle.danger, custom_id="close_ticket")
     async def close_ticket(self, interaction: discord.Interaction, button: Button):
         channel   = interaction.channel
-        owner_id  = int(channel.name.split("-", 1)[1])
+        owner_id  = int(channel.name.partition("-")[2])
         ticket_owner = channel.guild.get_member(owner_id)
         is_owner  = interaction.user.id == owner_id
         has_sup   = config.SUPPORT_ROLE_ID in [r.id for r in interaction.user.roles]
@@ -177,34 +178,47 @@ img.attachment {
 }
 """
 
-        # 4) Build each message bubble
-        messages_html = ""
+        # 4) Download attachments concurrently (a few at a time)
+        sem = asyncio.Semaphore(5)
+
+        async def encode_attachment(att):
+            async with sem:
+                return base64.b64encode(await att.read()).decode("ascii")
+
+        attachments = [att for m in msgs for att in m.attachments]
+        encoded = await asyncio.gather(*(encode_attachment(att) for att in attachments))
+        b64_by_id = {att.id: b64 for att, b64 in zip(attachments, encoded)}
+
+        # 5) Build each message bubble
+        parts = []
         for m in msgs:
             when    = m.created_at.strftime("%Y-%m-%d %H:%M")
             name    = html.escape(m.author.display_name)
             content = html.escape(m.content or "")
             avatar  = m.author.avatar.url if m.author.avatar else ""
 
-            messages_html += f"""
+            parts.append(f"""
 <div class="msg">
   <img class="avatar" src="{avatar}" alt="avatar">
   <div class="bubble">
     <span class="username">{name}</span>
     <span class="timestamp">{when}</span>
     <div class="text">{content}</div>
-"""
+""")
 
             # inline attachments
             for att in m.attachments:
-                b64  = base64.b64encode(await att.read()).decode("ascii")
+                b64  = b64_by_id[att.id]
                 ctype = att.content_type or "image/png"
-                messages_html += f"""
+                parts.append(f"""
     <img class="attachment" src="data:{ctype};base64,{b64}" alt="{att.filename}">
-"""
+""")
+
+            parts.append("  </div>\n</div>")
 
-            messages_html += "  </div>\n</div>"
+        messages_html = "".join(parts)
 
-        # 5) Assemble full HTML
+        # 6) Assemble full HTML
         now_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
         html_doc = f"""
 <!DOCTYPE html>
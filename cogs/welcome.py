@@ -3,7 +3,7 @@
 import discord
 from discord.ext import commands
 from discord import File
-from datetime import datetime
+from datetime import datetime, timezone
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 import os
@@ -149,7 +149,7 @@ class WelcomeCog(commands.Cog):
             title="회원 퇴장",
             description=f"**{member}**님이 서버를 떠났습니다.",
             color=discord.Color.dark_grey(),
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
         )
         embed.set_thumbnail(url=member.display_avatar.url)
         await log_to_channel(self.bot, f"👋 {member.display_name}님이 서버를 떠났습니다.")
@@ -1,14 +1,102 @@
+import asyncio
+import time
+
 import aiohttp
+import orjson
 import os
 
 HENRIK_API_KEY = os.getenv("HENRIK_API_KEY")
 
+# Retries after a transient failure before giving up
+MAX_RETRIES = 3
+# Statuses worth retrying: rate limiting and upstream hiccups
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Longest we'll wait on Henrik's rate limit; beyond this the caller gets None instead
+MAX_WAIT = 30
+
+# Shared session so every call reuses pooled connections instead of a fresh TLS handshake
+_session = None
+
+# endpoint -> task for requests currently in flight
+_inflight = {}
+
+# Last rate-limit state reported by Henrik (x-ratelimit-* headers)
+_rl_remaining = None
+_rl_reset_at = 0.0
+
+
+def _record_rate_limit(headers):
+    global _rl_remaining, _rl_reset_at
+    remaining = headers.get("x-ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset")
+    if remaining is not None and remaining.isdigit():
+        _rl_remaining = int(remaining)
+    if reset is not None and reset.isdigit():
+        # Henrik reports the seconds left until the window resets
+        _rl_reset_at = time.monotonic() + int(reset)
+
+
+async def _wait_for_quota() -> bool:
+    # Only pause when the current window is (nearly) used up
+    if _rl_remaining is not None and _rl_remaining <= 1:
+        delay = _rl_reset_at - time.monotonic()
+        if delay > MAX_WAIT:
+            return False
+        if delay > 0:
+            await asyncio.sleep(delay)
+    return True
+
+
+def _get_session() -> aiohttp.ClientSession:
+    global _session
+    # Created lazily so it binds to the bot's running event loop
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=64, ttl_dns_cache=300),
+            headers={"Authorization": HENRIK_API_KEY or ""},
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
 async def henrik_get(endpoint: str) -> dict:
+    # Concurrent callers for the same endpoint share one in-flight request
+    task = _inflight.get(endpoint)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(endpoint))
+        _inflight[endpoint] = task
+        task.add_done_callback(lambda _: _inflight.pop(endpoint, None))
+    # Shielded so one caller being cancelled doesn't cancel the others' request
+    return await asyncio.shield(task)
+
+
+async def _fetch(endpoint: str) -> dict:
     base = "https://api.henrikdev.xyz"
-    headers = {"Authorization": HENRIK_API_KEY}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(base + endpoint, headers=headers) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            else:
+    for attempt in range(MAX_RETRIES + 1):
+        if not await _wait_for_quota():
+            return None
+        delay = 2 ** attempt
+        try:
+            async with _get_session().get(base + endpoint) as resp:
+                _record_rate_limit(resp.headers)
+                if resp.status == 200:
+                    return orjson.loads(await resp.read())
+                if resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return None
+                retry_after = resp.headers.get("Retry-After")
+                if retry_after is not None and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                if delay > MAX_WAIT:
+                    return None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
                 return None
+        # Transient failure: back off exponentially before retrying
+        await asyncio.sleep(delay)
@@ -1,5 +1,6 @@
 # utils/logger.py new
 
+import asyncio
 import discord
 from utils import config
 
@@ -8,3 +9,20 @@ async def log_to_channel(bot, message: str):
     if channel:
         await channel.send(f"📋 {message}")
     print("[LOG]", message)
+
+# Strong references so background log tasks aren't garbage-collected mid-send
+_log_tasks = set()
+
+def log_lines_to_channel(bot, lines, per_message: int = 10):
+    """Send lines in chunks of per_message, in order, from one background task."""
+    if not lines:
+        return None
+
+    async def _send():
+        for i in range(0, len(lines), per_message):
+            await log_to_channel(bot, "\n".join(lines[i:i + per_message]))
+
+    task = asyncio.create_task(_send())
+    _log_tasks.add(task)
+    task.add_done_callback(_log_tasks.discard)
+    return task